@@ -1,31 +1,84 @@
 import csv
 import sys
-import json
-from xml.dom import minidom
+from xml.etree import ElementTree
 import re
-
-
-def point_inside_state(x, y, bounds):
+from collections import defaultdict
+from multiprocessing import Pool
+
+import numpy as np
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# Regular expressions used by process_tweet.
+_URL_RE = re.compile(r'((www\.[\s]+)|(https?://[^\s]+))')
+_USER_RE = re.compile(r'@[^\s]+')
+# Matches urls, usernames, and hashtags in one pass. Urls inside a username or
+#     hashtag are matched as a whole, since 'www.' and the white spaces after
+#     it are replaced by _URL_RE before the username or hashtag would end.
+_TOKEN_RE = re.compile(r'(www\.[\s]+|https?://[^\s]+)|'
+                       r'(@(?:www\.[\s]+|https?://[^\s]+|[^\s])+)|'
+                       r'#((?:www\.[\s]+|https?://[^\s]+|[^\s])+)')
+_WORD_RE = re.compile(r"[\w']+")
+_REPEAT_RE = re.compile(r"(.)\1{1,}", re.DOTALL)
+
+
+def point_inside_state(x, y, px, py):
     """
     Determines if a point is inside the boundaries of a given state. The state
-    is a list of (x, y) pairs marking its boundaries. Based on point in polygon
-    routine taken from http://www.ariel.com.au/a/python-point-int-poly.html.
+    is given as arrays of the x and y coordinates of its closed boundaries.
+    Based on point in polygon routine taken from
+    http://www.ariel.com.au/a/python-point-int-poly.html, with the crossings of
+    all edges computed at once.
 
     Args:
         x: the latitude of a point.
         y: the longitude of a point.
-        bounds: a list of (x, y) pairs marking boundaries of state in same units
-            as x and y.
+        px: an array with the x coordinates of the boundaries of state in same
+            units as x. The last point is the same as the first.
+        py: an array with the y coordinates of the boundaries of state in same
+            units as y. The last point is the same as the first.
 
     Returns:
         A boolean indicating if the point is in the given boundaries. 
     """
-    n = len(bounds)
-    inside = False
+    # The boundaries are closed, so the edges are pairs of consecutive points
+    #     and the ends of the edges are views of the arrays.
+    p1x, p1y = px[:-1], py[:-1]
+    p2x, p2y = px[1:], py[1:]
+
+    cond = ((y > np.minimum(p1y, p2y)) & (y <= np.maximum(p1y, p2y)) &
+            (x <= np.maximum(p1x, p2x)))
+    # Horizontal edges never pass the test above, so their divisor can be
+    #     anything non-zero.
+    xinters = (y-p1y) * (p2x-p1x) / np.where(p2y != p1y, p2y-p1y, 1)+p1x
+    cond &= (p1x == p2x) | (x <= xinters)
+
+    return bool(np.bitwise_xor.reduce(cond))
+
 
-    p1x, p1y = bounds[0]
-    for i in range(n+1):
-        p2x, p2y = bounds[i % n]
+def _pip(x, y, px, py):
+    """
+    Point in polygon test of point_inside_state written as a loop over the
+    edges, to be compiled with Numba.
+    """
+    n = px.size
+    inside = False
+    xinters = 0.0
+
+    # The boundaries are closed, so the loop needs no wrap-around index.
+    p1x = px[0]
+    p1y = py[0]
+    for i in range(1, n):
+        p2x = px[i]
+        p2y = py[i]
         if y > min(p1y, p2y):
             if y <= max(p1y, p2y):
                 if x <= max(p1x, p2x):
@@ -33,18 +86,75 @@ def point_inside_state(x, y, bounds):
                         xinters = (y-p1y) * (p2x-p1x) / (p2y-p1y)+p1x
                     if p1x == p2x or x <= xinters:
                         inside = not inside
-        p1x, p1y = p2x, p2y
+        p1x = p2x
+        p1y = p2y
+
+    return inside
+
+
+if njit is not None:
+    _pip = njit(cache=True)(_pip)
+else:
+    # Without Numba the vectorized version is much faster than the loop.
+    _pip = point_inside_state
+
+
+def points_inside_state(xs, ys, px, py):
+    """
+    Determines for many points at once if they are inside the boundaries of a
+    given state, like point_inside_state. The crossings of each edge are
+    computed for all points together.
+
+    Args:
+        xs: an array with the latitudes of the points.
+        ys: an array with the longitudes of the points.
+        px: an array with the x coordinates of the closed boundaries of state.
+        py: an array with the y coordinates of the closed boundaries of state.
+
+    Returns:
+        A boolean array indicating for each point if it is in the given
+        boundaries.
+    """
+    inside = np.zeros(xs.size, dtype=np.bool_)
+
+    for p1x, p1y, p2x, p2y in zip(px[:-1], py[:-1], px[1:], py[1:]):
+        # Horizontal edges are never crossed.
+        if p1y == p2y:
+            continue
+        cond = ((ys > min(p1y, p2y)) & (ys <= max(p1y, p2y)) &
+                (xs <= max(p1x, p2x)))
+        if p1x != p2x:
+            cond &= xs <= (ys-p1y) * (p2x-p1x) / (p2y-p1y)+p1x
+        inside ^= cond
 
     return inside
 
 
+def _pip_batch(xs, ys, px, py):
+    """
+    Point in polygon test of points_inside_state written as a loop over the
+    points, to be compiled with Numba, which splits the points among threads.
+    """
+    inside = np.zeros(xs.size, dtype=np.bool_)
+    for i in prange(xs.size):
+        inside[i] = _pip(xs[i], ys[i], px, py)
+
+    return inside
+
+
+if njit is not None:
+    _pip_batch = njit(parallel=True, cache=True)(_pip_batch)
+else:
+    _pip_batch = points_inside_state
+
+
 def state_of_point(state_bounds, lat, lon):
     """
     Finds the US state for a given location.
 
     Args:
-        state_bounds: a dictionary mapping state names to the (x, y) pairs of
-            its boundaries.
+        state_bounds: a dictionary mapping state names to the coordinate
+            arrays and bounding box of its boundaries.
         lat: the latitude of location.
         lon: the longitude of location.
     
@@ -52,54 +162,94 @@ def state_of_point(state_bounds, lat, lon):
         Name of the state as a string. If the location can't be found in any of
         the state boundaries the string 'No state found' is returned instead.
     """
-    for state in state_bounds.keys():
-        inside = point_inside_state(lat, lon, state_bounds[state])
-        if inside:
+    for state, (px, py, xmin, xmax, ymin, ymax) in state_bounds.items():
+        # Skip states whose bounding box does not contain the location.
+        if lat < xmin or lat > xmax or lon < ymin or lon > ymax:
+            continue
+        if _pip(lat, lon, px, py):
             return state 
 
     return 'No state found'
 
 
-def process_tweet(tweet):
+def states_of_points(state_bounds, lats, lons):
+    """
+    Finds the US states for many locations at once. The locations inside the
+    bounding box of a state are tested against its boundaries together.
+
+    Args:
+        state_bounds: a dictionary mapping state names to the coordinate
+            arrays and bounding box of its boundaries.
+        lats: an array with the latitudes of the locations.
+        lons: an array with the longitudes of the locations.
+
+    Returns:
+        A list with the name of the state of each location. Like in
+        state_of_point, the string 'No state found' is used for locations that
+        can't be found in any of the state boundaries.
+    """
+    names = list(state_bounds) + ['No state found']
+    # Index of the state of each location in names, -1 if not found yet.
+    found = np.full(lats.size, -1)
+
+    for i, (px, py, xmin, xmax, ymin, ymax) in enumerate(state_bounds.values()):
+        # Only test locations inside the bounding box without a state yet, so
+        #     the first state found is kept like in state_of_point.
+        candidates = np.flatnonzero((found == -1) &
+                                    (lats >= xmin) & (lats <= xmax) &
+                                    (lons >= ymin) & (lons <= ymax))
+        if candidates.size == 0:
+            continue
+        inside = _pip_batch(lats[candidates], lons[candidates], px, py)
+        found[candidates[inside]] = i
+
+    return [names[i] for i in found]
+
+
+def _replace_token(match):
+    """
+    Replacement for a match of _TOKEN_RE in process_tweet.
+    """
+    if match.group(1):
+        return 'URL'
+    if match.group(2):
+        return 'USER'
+    # Replace urls and usernames inside the hashtag.
+    return _USER_RE.sub('USER', _URL_RE.sub('URL', match.group(3)))
+
+
+def process_tweet(tweet, stop_words=frozenset()):
     """
     Processes text of tweet to get a list of words without white spaces,
-    punctuation marks, urls, and usernames.
+    punctuation marks, urls, usernames, and stop words.
 
     Args:
         tweet: the text of a tweet to be processed.
+        stop_words: a set of words to be removed from the tweet.
     
     Returns:
         A list of words in tweet. 
     """
-    # Convert to lower case.
-    tweet = tweet.lower()
-    # Convert www.* or https?://* to URL.
-    tweet = re.sub('((www\.[\s]+)|(https?://[^\s]+))', 'URL', tweet)
-    # Convert @username to USER.
-    tweet = re.sub('@[^\s]+', 'USER', tweet)
-    # Remove additional white spaces.
-    tweet = re.sub('[\s]+', ' ', tweet)
-    # Replace #word with word.
-    tweet = re.sub(r'#([^\s]+)', r'\1', tweet)
+    # Convert to lower case. Then, in a single pass, convert www.* or
+    #     https?://* to URL, convert @username to USER, and replace #word with
+    #     word. White spaces are left as they are, since they only separate
+    #     the words found below.
+    tweet = _TOKEN_RE.sub(_replace_token, tweet.lower())
     # Trim.
     tweet = tweet.strip('\'"')
 
+    # Replace two or more repetitions of characters. A repetition never spans
+    #     the boundary of a word, so the whole tweet can be done at once.
+    tweet = _REPEAT_RE.sub(r"\1\1", tweet)
+
     # Get words.
-    w_list = re.findall(r"[\w']+", tweet)
-    # Replace two or more repetitions of characters.
-    pattern = re.compile(r"(.)\1{1,}", re.DOTALL)
-    w_list = [pattern.sub(r"\1\1", w) for w in w_list]
-    # Strip words,
-    w_list = [w.strip('\'"?,.') for w in w_list]
-    #  of apostrophe.
-    w_list = [w.split('\'')[0] for w in w_list]
-
-    # Remove empty strings.
-    w_list = filter(None, w_list)
-    # Remove words starting with numbers.
-    w_list = [w for w in w_list if not w[0].isdigit()]
-
-    return w_list 
+    w_list = _WORD_RE.findall(tweet)
+    # Strip words of punctuation marks and of apostrophe.
+    w_list = [w.strip('\'"?,.').split('\'')[0] for w in w_list]
+
+    # Remove empty strings, words starting with numbers, and stop words.
+    return [w for w in w_list
+            if w and not w[0].isdigit() and w not in stop_words]
 
     
 def get_sentiment(tweet, sent_dict):
@@ -113,8 +263,8 @@ def get_sentiment(tweet, sent_dict):
     Returns:
         The sum of the sentiment scores for each word.
     """
-    return sum([sent_dict[word] for word in tweet 
-                if word in sent_dict])
+    get = sent_dict.get
+    return sum(get(word, 0) for word in tweet)
 
 
 def create_state_bound_dict(filename):
@@ -125,26 +275,33 @@ def create_state_bound_dict(filename):
         filename: name of the file with polygon data for the US states.
 
     Returns:
-        A dictionary that maps the names of a US state to a list of (x, y) pairs
-        that describe the polygon shape of its boundaries in longitude and 
-        latitude.
+        A dictionary that maps the names of a US state to a tuple
+        (px, py, xmin, xmax, ymin, ymax). px and py are contiguous float64
+        arrays that describe the polygon shape of its boundaries in latitude
+        and longitude, closed so that the last point is the same as the
+        first. The remaining values are the bounding box of the polygon.
     """
     state_bounds = {}
     
-    xmldoc = minidom.parse(filename)
-    state_list = xmldoc.getElementsByTagName('state')
-    
-    # Fill dictionary with state names and boundaries.
-    for state in state_list:
-        state_name = state.attributes['name'].value
-        point_list = state.getElementsByTagName("point")
-        bounds = []
-        for point in point_list:
-            lat = point.attributes['lat'].value 
-            lon = point.attributes['lng'].value 
-            bounds = bounds + [(float(lat), float(lon))]
-        
-        state_bounds[state_name] = bounds
+    # Fill dictionary with state names and boundaries. The file is parsed
+    #     incrementally and each state is cleared once it has been read.
+    for _, state in ElementTree.iterparse(filename):
+        if state.tag != 'state':
+            continue
+        state_name = state.get('name')
+        point_list = state.findall('point')
+        px = np.fromiter((float(point.get('lat')) for point in point_list),
+                         dtype=np.float64, count=len(point_list))
+        py = np.fromiter((float(point.get('lng')) for point in point_list),
+                         dtype=np.float64, count=len(point_list))
+        # Close the boundaries, so the edges of the polygon are the pairs of
+        #     consecutive points.
+        if px[0] != px[-1] or py[0] != py[-1]:
+            px = np.append(px, px[0])
+            py = np.append(py, py[0])
+        state_bounds[state_name] = (px, py, float(px.min()), float(px.max()),
+                                    float(py.min()), float(py.max()))
+        state.clear()
 
     return state_bounds
 
@@ -167,17 +324,21 @@ def create_city_dict(filename):
               "cc2", "admin1_code", "admin2_code", "admin3_code", "admin4_code",
               "population", "elevation", "dem", "timezone", "modification_date"]
      
-    cities_file = open(filename, 'rb')
+    city_idx = fields.index('asciiname')
+    lat_idx = fields.index('latitude')
+    lon_idx = fields.index('longitude')
+     
+    cities_file = open(filename, encoding='utf-8', newline='')
     
-    for line in cities_file:
+    # The file is tab-delimited and has no quoting.
+    for field_list in csv.reader(cities_file, delimiter='\t',
+                                 quoting=csv.QUOTE_NONE):
        # Fill dictionary with cities and coordinates.
        # If a city already exists in dictionary take the city with the higher
        #     poulation.
-       field_list = line.split('\t')
-    
-       city = field_list[fields.index('asciiname')]
-       lat = field_list[fields.index('latitude')]
-       lon = field_list[fields.index('longitude')] 
+       city = field_list[city_idx]
+       lat = field_list[lat_idx]
+       lon = field_list[lon_idx] 
     
        city_dict[city] = (float(lon), float(lat))
 
@@ -195,18 +356,99 @@ def create_sent_dict(filename):
     Returns:
         A dictionary mapping a word to a sentiment score
     """
-    scores = {}
-    
-    sent_file = open(filename)
-    for line in sent_file:
-        # The file is tab-delimited.
-        term, score  = line.split("\t")  
-        # Convert the score to an integer.
-        scores[term] = int(score)  
+    sent_file = open(filename, encoding='utf-8', newline='')
+    # The file is tab-delimited. Convert the score to an integer.
+    scores = {term: int(score) for term, score in
+              csv.reader(sent_file, delimiter='\t', quoting=csv.QUOTE_NONE)}
+    sent_file.close()
    
     return scores
  
 
+# Data shared by the worker processes of main, set by _init_worker.
+_worker_data = None
+
+
+def _init_worker(city_dict, stop_words):
+    """
+    Stores the data needed by _select_tweet and _tokenize in a worker process,
+    so it is sent to each process once instead of with every tweet.
+    """
+    global _worker_data
+    _worker_data = (city_dict, stop_words)
+
+
+def _select_tweet(line):
+    """
+    Selects a tweet if it has english text and is sent from the US, and gets
+    its coordinates.
+
+    Args:
+        line: a line of the twitter input file with the tweet in JSON format.
+
+    Returns:
+        A tuple (id, lat, lon, text) for a selected tweet, None otherwise.
+    """
+    city_dict = _worker_data[0]
+
+    tweet_temp = json_loads(line)
+    
+    # Does the tweet have a text?
+    if 'text' in tweet_temp:
+        coord = False 
+        city = ""
+        ctry = ""
+        coord_place = 0
+        coord_coord = 0
+
+        user = tweet_temp['user']
+
+        # Is it in english? 
+        if user['lang'] == 'en':
+
+            # Is a place specified?
+            if tweet_temp['place']:
+                place = tweet_temp['place']
+
+                # Is it in the US?
+                if place['country'] == 'United States':
+                    ctry = place['country']
+                    # Get coordinates of place
+                    coord_place = place['bounding_box']['coordinates'][0][0]
+
+            # Are the coordinates specified?
+            if tweet_temp['coordinates']:
+                # Get coordinates
+                coord_coord = tweet_temp['coordinates']['coordinates']
+
+            # Is there a user location specified?
+            if user['location']:
+                # Get name of location/city
+                city = user['location'].split(',')[0]
+
+        # Get coordinates for the tweet
+        if coord_coord:
+            coord = coord_coord
+        elif coord_place:
+            coord = coord_place
+        elif city_dict is not None: 
+            if city:
+                if city in city_dict:
+                    coord = city_dict[city]
+        
+        if coord:
+            return tweet_temp["id"], coord[1], coord[0], tweet_temp["text"]
+
+    return None
+
+
+def _tokenize(text):
+    """
+    Gets the words of the text of a tweet with process_tweet.
+    """
+    return process_tweet(text, _worker_data[1])
+
+
 def main():
     """
     This program performs a sentiment analysis of twitter tweets in the US.
@@ -228,8 +470,8 @@ def main():
         > python happyStates.py twitter_output.txt output.txt 
         > python happyStates.py twitter_output.txt output.txt 1 
     """
-    tweet_file = open(sys.argv[1])
-    out_file = open(sys.argv[2], 'w+')
+    tweet_file = open(sys.argv[1], 'rb')
+    out_file = open(sys.argv[2], 'w+', encoding='utf-8', newline='')
    
     city_arg = 0
     if len(sys.argv) == 4:
@@ -241,96 +483,64 @@ def main():
     state_bounds = create_state_bound_dict("input_files/states.xml")
    
     # Optional: Get dictionary of city names and locations
+    city_dict = None
     if city_arg == 1:
         city_dict = create_city_dict("input_files/US_cities.txt") 
-    
-    # Get tweets
-    tweets = tweet_file.readlines()
+        # Users in New York City often give 'New York' as their location.
+        city_dict.pop('New York', None)
+        if 'New York City' in city_dict:
+            city_dict['New York'] = city_dict['New York City']
     
     # Get list of stopwords.
     # Taken from https://github.com/ravikiranj. Added USER and RT. 
-    stop_words = []
-    
-    stop_file = open('input_files/stopwords.txt', 'rb')
-    lines = stop_file.readlines()
-    stop_words = [w.strip() for w in lines]
+    stop_file = open('input_files/stopwords.txt')
+    stop_words = frozenset(w.strip() for w in stop_file)
     
     stop_file.close()
     
-    # Select tweets that have english text and are sent from the US. Get their
-    #     coordinates and the state they were sent from
+    # Select tweets that have english text and are sent from the US, and get
+    #     their coordinates. The tweets are read one line at a time and
+    #     processed in parallel, in the order of the file.
     tweet_dict = {}
-    for t in tweets:
-        tweet_temp = json.loads(t)
-        
-        # Does the tweet have a text?
-        if 'text' in tweet_temp:
-            coord = False 
-            city = ""
-            ctry = ""
-            coord_place = 0
-            coord_coord = 0
-    
-            user = tweet_temp['user']
-    
-            # Is it in english? 
-            if user['lang'] == 'en':
-    
-                # Is a place specified?
-                if tweet_temp['place']:
-                    place = tweet_temp['place']
-    
-                    # Is it in the US?
-                    if place['country'] == 'United States':
-                        ctry = place['country']
-                        # Get coordinates of place
-                        coord_place = place['bounding_box']['coordinates'][0][0]
-    
-                # Are the coordinates specified?
-                if tweet_temp['coordinates']:
-                    # Get coordinates
-                    coord_coord = tweet_temp['coordinates']['coordinates']
-    
-                # Is there a user location specified?
-                if user['location']:
-                    # Get name of location/city
-                    city = user['location'].split(',')[0]
-    
-            # Get coordinates for the tweet and determine state it was sent from
-            if coord_coord:
-                coord = coord_coord
-                state = state_of_point(state_bounds, coord[1], coord[0])
-            elif coord_place:
-                coord = coord_place
-                state = state_of_point(state_bounds, coord[1], coord[0])
-            elif city_arg == 1: 
-                if city:
-                    if city == 'New York':
-                        city = 'New York City'
-                    if city in city_dict:
-                        coord = city_dict[city]
-                        state = state_of_point(state_bounds, coord[1], coord[0])
-            
-            if coord:
-                if state != 'No state found': 
-                    text_list = process_tweet(tweet_temp['text'])
-                    # Remove word from stop_words
-                    text_list = [w for w in text_list if w not in stop_words]
-    
-                    tweet_dict[tweet_temp["id"]] = [state, coord[1], coord[0],
-                                                    text_list, tweet_temp["text"]]
-    
+    with Pool(initializer=_init_worker,
+              initargs=(city_dict, stop_words)) as pool:
+        tweets = [t for t in pool.imap(_select_tweet, tweet_file,
+                                       chunksize=1024) if t]
+
+        # Determine the states the tweets were sent from, all at once.
+        lats = np.fromiter((t[1] for t in tweets), dtype=np.float64,
+                           count=len(tweets))
+        lons = np.fromiter((t[2] for t in tweets), dtype=np.float64,
+                           count=len(tweets))
+        states = states_of_points(state_bounds, lats, lons)
+        tweets = [(t, state) for t, state in zip(tweets, states)
+                  if state != 'No state found']
+
+        # Get the words of the tweets sent from a state.
+        text_lists = pool.imap(_tokenize, [t[3] for t, _ in tweets],
+                               chunksize=1024)
+        for (tweet, state), text_list in zip(tweets, text_lists):
+            tweet_id, lat, lon, text = tweet
+            tweet_dict[tweet_id] = [state, lat, lon, text_list, text]
+    
+    tweet_file.close()
     
     # Create sentiment dictionary
     # Use wordlist/affective lexicon by Finn Årup Nielsen: http://neuro.imm.dtu.dk/wiki/AFINN
     scores = create_sent_dict("input_files/AFINN-111.txt")
 
-    # Initialize term sentiment dictionary for new words
-    # The structure is: {word: [overall sentiment, number of occurence]}
-    term_sents = {}
+    # Initialize term sentiment dictionaries for new words, with the overall
+    #   sentiment and the number of occurence of each word
+    term_sums = defaultdict(float)
+    term_counts = defaultdict(int)
     
+    known_words = scores.keys()
     for value in tweet_dict.values():
         text_list = value[3]
+        # Skip tweets without any word from the sent_file, they have no score
+        #   to pass on to new words.
+        if known_words.isdisjoint(text_list):
+            continue
     
         score = 0
         word_count = 0
@@ -352,35 +562,27 @@ def main():
                 # Fill the dictionary with the cummulative sentiment and 
                 #   number of occurence of each word
                 if word not in scores:
-                    if word in term_sents:
-                        term_sents[word] = [a+b for a, b in 
-                                            zip(term_sents[word], [word_sent, 1])]
-                    else:
-                        term_sents[word] = [word_sent, 1]
-    
-    # Make new extended dictionary with new words and sentiments
-    scores_update = {}
-    
-    for key, value in term_sents.items():
-        # Get score for each new word: overall sentiment / number of occurence
-        scores_update[key] = value[0] / value[1]
+                    term_sums[word] += word_sent
+                    term_counts[word] += 1
+    
+    # Make new extended dictionary, starting from the initial list from
+    #   sent_file
+    scores_update = dict(scores)
+    # Add the score for each new word: overall sentiment / number of occurence
+    scores_update.update((key, value / term_counts[key])
+                         for key, value in term_sums.items())
     #for key, value in scores_update.items():
     #    print key, ',', value
-
-    # Update with initial list from sent_file
-    scores_update.update(scores)
     
-    # Get sentiment score for each tweet and append to tweet_dictionary
+    # Get sentiment score for each tweet and write it out with the tweet
     output = csv.writer(out_file, delimiter=',')
     header = ['id', 'state', 'lat', 'lon', 'words', 'text', 'score']
     output.writerow(header)
 
-    for key, value in tweet_dict.items():
-        tweet_dict[key] = value + [get_sentiment(value[3], scores_update)] 
-        output.writerow([key] + 
-                        tweet_dict[key][0:4] + 
-                        [tweet_dict[key][4].encode("utf-8")] + 
-                        [tweet_dict[key][-1]])
+    output.writerows((key, state, lat, lon, text_list, text,
+                      get_sentiment(text_list, scores_update))
+                     for key, (state, lat, lon, text_list, text)
+                     in tweet_dict.items())
     out_file.close()
 
 if __name__ == '__main__':